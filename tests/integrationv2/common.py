@@ -2,29 +2,78 @@ import os
 import re
 import subprocess
 import string
-import threading
+import sys
+import itertools
+
+from dataclasses import dataclass, fields
+from functools import lru_cache, total_ordering
+from typing import Any
 
 from constants import TEST_CERT_DIRECTORY
 
+# numpy is not a hard dependency of the integration tests; it is only
+# used as a fast path for building very large payloads.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Repeating pattern used by data_bytes. These bytes purposefully fall
+# outside of the ascii range to prevent triggering "connected commands"
+# present in some SSL clients.
+_DATA_PATTERN = bytes(range(128, 255))
+
+# Payloads at least this large are built with numpy when it is available.
+_NUMPY_THRESHOLD = 4096
 
+if numpy is not None:
+    _NUMPY_PATTERN = numpy.frombuffer(_DATA_PATTERN, dtype=numpy.uint8)
+
+
+@lru_cache(maxsize=32)
 def data_bytes(n_bytes):
     """
     Generate bytes to send over the TLS connection.
-    These bytes purposefully fall outside of the ascii range
-    to prevent triggering "connected commands" present in
-    some SSL clients.
+    The bytes cycle through the non-ascii pattern above. Repeating the
+    precomputed pattern keeps the work in C instead of a per-byte
+    Python loop, and multi-megabyte payloads are tiled with numpy when
+    it is installed.
+
+    Tests tend to reuse a handful of payload sizes, so the results are
+    memoized. The returned bytes object is shared between callers; it is
+    immutable, so this is safe.
+    """
+    quotient, remainder = divmod(n_bytes, len(_DATA_PATTERN))
+
+    if numpy is not None and n_bytes >= _NUMPY_THRESHOLD:
+        return numpy.tile(_NUMPY_PATTERN, quotient + 1)[:n_bytes].tobytes()
+
+    return _DATA_PATTERN * quotient + _DATA_PATTERN[:remainder]
+
+
+# Matches the xdist worker ids, which look like "gw0", "gw1", etc.
+_WORKER_RE = re.compile(r'gw(\d+)')
+
+
+def _xdist_worker_id():
+    """
+    If xdist is being used, parse the workerid from the envvar. This can
+    be used to allocate unique ports to each worker.
     """
-    byte_array = [0] * n_bytes
-    allowed = [i for i in range(128, 255)]
+    worker = os.getenv('PYTEST_XDIST_WORKER')
+    if worker is not None:
+        match = _WORKER_RE.match(worker)
+        if match:
+            return int(match.group(1))
+    return 0
 
-    j = 0
-    for i in range(n_bytes):
-        byte_array[i] = allowed[j]
-        j += 1
-        if j > 126:
-            j = 0
 
-    return bytes(byte_array)
+# This is a naive way to allocate ports, but it allows us to cut
+# the run time in half without workers colliding. The counter is shared
+# by every AvailablePorts instance in this worker, so separate instances
+# never hand out the same port.
+_PORT_COUNTER = itertools.count(8000 + (_xdist_worker_id() * 100))
 
 
 class AvailablePorts(object):
@@ -34,27 +83,19 @@ class AvailablePorts(object):
     that all need unique port numbers.
     """
 
-    def __init__(self, low=8000, high=30000):
-        # If xdist is being used, parse the workerid from the envvar. This can
-        # be used to allocate unique ports to each worker.
-        worker = os.getenv('PYTEST_XDIST_WORKER')
-        worker_id = 0
-        if worker is not None:
-            worker_id = re.findall('gw(\d+)', worker)
-            if len(worker_id) != 0:
-                worker_id = int(worker_id[0])
-
-        # This is a naive way to allocate ports, but it allows us to cut
-        # the run time in half without workers colliding.
-        self.ports = iter(range(low + (worker_id * 100), high))
-        self.lock = threading.Lock()
+    def __init__(self, high=30000):
+        self.high = high
 
     def __iter__(self):
         return self
 
     def __next__(self):
-        with self.lock:
-            return next(self.ports)
+        # itertools.count advances in C, so a single next() is atomic
+        # under the GIL and no lock is needed.
+        port = next(_PORT_COUNTER)
+        if port >= self.high:
+            raise StopIteration
+        return port
 
 
 class TimeoutException(subprocess.SubprocessError):
@@ -64,79 +105,128 @@ class TimeoutException(subprocess.SubprocessError):
     """
     def __init__(self, timeout_exception):
         self.exception = timeout_exception
+        # Format the message once; the exception may be stringified into
+        # several log sinks for the same failed test.
+        self.cmd_str = " ".join(timeout_exception.cmd)
+        self._msg = "{} {}".format(timeout_exception, self.cmd_str)
 
     def __str__(self):
-        cmd = " ".join(self.exception.cmd)
-        return "{} {}".format(self.exception, cmd)
+        return self._msg
+
+
+# Maps a token found in a cert or cipher name to the certificate
+# algorithm it implies. Order matters: ECDSA names also contain "RSA".
+_ALGORITHM_TOKENS = (
+    ('ECDSA', 'EC'),
+    ('RSA', 'RSA'),
+)
+
+
+def _algorithm_from_name(name):
+    return next((algorithm for token, algorithm in _ALGORITHM_TOKENS if token in name), 'ANY')
 
 
 class Cert(object):
-    def __init__(self, name, prefix, location=TEST_CERT_DIRECTORY):
-        self.name = name
-        self.cert = location + prefix + "_cert.pem"
-        self.key = location + prefix + "_key.pem"
-        self.algorithm = 'ANY'
+    __slots__ = ('name', 'cert', 'key', 'algorithm', '_family')
 
-        if 'ECDSA' in name:
-            self.algorithm = 'EC'
-        elif 'RSA' in name:
-            self.algorithm = 'RSA'
+    def __init__(self, name, prefix, location=TEST_CERT_DIRECTORY):
+        # The name is what __str__ returns, so it ends up in pytest test
+        # ids and log lines; interning it makes those repeated string
+        # comparisons pointer checks.
+        self.name = sys.intern(name)
+        # Interning the paths means Certs sharing a pem file also share
+        # one string object, so later comparisons are pointer checks.
+        self.cert = sys.intern(f"{location}{prefix}_cert.pem")
+        self.key = sys.intern(f"{location}{prefix}_key.pem")
+        self.algorithm = _algorithm_from_name(name)
+        # Precomputed key for curve compatibility checks, so the hot
+        # parametrization loops don't re-slice the name on every call.
+        self._family = self.name[:-3]
 
     def compatible_with_cipher(self, cipher):
         return (self.algorithm == cipher.algorithm) or (cipher.algorithm == 'ANY')
 
     def compatible_with_curve(self, curve):
-        if self.algorithm != 'EC':
-            return True
-
-        return curve.name[:-3] == self.name[:-3]
+        return self.algorithm != 'EC' or curve._family == self._family
 
     def __str__(self):
         return self.name
 
 
-class Certificates(object):
+class _LazyTableMeta(type):
+    """
+    Metaclass backing the Certificates and Ciphers tables. Entries are
+    described by the table's _spec dict of constructor arguments and only
+    constructed on first attribute access, so importing this module does
+    not pay for entries a test run never touches. The index attributes
+    named in _lazy_indexes materialize the full table on first use.
+    """
+    def __getattr__(cls, name):
+        spec = cls.__dict__.get('_spec')
+        if spec is not None and name in spec:
+            entry = cls._entry(*spec[name])
+            setattr(cls, name, entry)
+            return entry
+        if name in cls.__dict__.get('_lazy_indexes', ()):
+            cls._build_indexes()
+            return cls.__dict__[name]
+        raise AttributeError("type object '{}' has no attribute '{}'".format(cls.__name__, name))
+
+
+class Certificates(object, metaclass=_LazyTableMeta):
     """
     When referencing certificates, use these values.
     """
-    RSA_1024_SHA256 = Cert("RSA_1024_SHA256", "rsa_1024_sha256_client")
-    RSA_1024_SHA384 = Cert("RSA_1024_SHA384", "rsa_1024_sha384_client")
-    RSA_1024_SHA512 = Cert("RSA_1024_SHA512", "rsa_1024_sha512_client")
-    RSA_2048_SHA256 = Cert("RSA_2048_SHA256", "rsa_2048_sha256_client")
-    RSA_2048_SHA384 = Cert("RSA_2048_SHA384", "rsa_2048_sha384_client")
-    RSA_2048_SHA512 = Cert("RSA_2048_SHA512", "rsa_2048_sha512_client")
-    RSA_3072_SHA256 = Cert("RSA_3072_SHA256", "rsa_3072_sha256_client")
-    RSA_3072_SHA384 = Cert("RSA_3072_SHA384", "rsa_3072_sha384_client")
-    RSA_3072_SHA512 = Cert("RSA_3072_SHA512", "rsa_3072_sha512_client")
-    RSA_4096_SHA256 = Cert("RSA_4096_SHA256", "rsa_4096_sha256_client")
-    RSA_4096_SHA384 = Cert("RSA_4096_SHA384", "rsa_4096_sha384_client")
-    RSA_4096_SHA512 = Cert("RSA_4096_SHA512", "rsa_4096_sha512_client")
-    ECDSA_256 = Cert("ECDSA_256", "ecdsa_p256_pkcs1")
-    ECDSA_384 = Cert("ECDSA_384", "ecdsa_p384_pkcs1")
-
-    RSA_2048_SHA256_WILDCARD = Cert("RSA_2048_SHA256_WILDCARD", "rsa_2048_sha256_wildcard")
-
-
+    _entry = Cert
+    _lazy_indexes = ('ALL', 'BY_NAME', 'BY_ALGO')
+    _spec = {
+        'RSA_1024_SHA256': ("RSA_1024_SHA256", "rsa_1024_sha256_client"),
+        'RSA_1024_SHA384': ("RSA_1024_SHA384", "rsa_1024_sha384_client"),
+        'RSA_1024_SHA512': ("RSA_1024_SHA512", "rsa_1024_sha512_client"),
+        'RSA_2048_SHA256': ("RSA_2048_SHA256", "rsa_2048_sha256_client"),
+        'RSA_2048_SHA384': ("RSA_2048_SHA384", "rsa_2048_sha384_client"),
+        'RSA_2048_SHA512': ("RSA_2048_SHA512", "rsa_2048_sha512_client"),
+        'RSA_3072_SHA256': ("RSA_3072_SHA256", "rsa_3072_sha256_client"),
+        'RSA_3072_SHA384': ("RSA_3072_SHA384", "rsa_3072_sha384_client"),
+        'RSA_3072_SHA512': ("RSA_3072_SHA512", "rsa_3072_sha512_client"),
+        'RSA_4096_SHA256': ("RSA_4096_SHA256", "rsa_4096_sha256_client"),
+        'RSA_4096_SHA384': ("RSA_4096_SHA384", "rsa_4096_sha384_client"),
+        'RSA_4096_SHA512': ("RSA_4096_SHA512", "rsa_4096_sha512_client"),
+        'ECDSA_256': ("ECDSA_256", "ecdsa_p256_pkcs1"),
+        'ECDSA_384': ("ECDSA_384", "ecdsa_p384_pkcs1"),
+
+        'RSA_2048_SHA256_WILDCARD': ("RSA_2048_SHA256_WILDCARD", "rsa_2048_sha256_wildcard"),
+    }
+
+    @classmethod
+    def _build_indexes(cls):
+        certs = [getattr(cls, name) for name in cls._spec]
+        cls.ALL = tuple(certs)
+        cls.BY_NAME = {c.name: c for c in certs}
+        cls.BY_ALGO = {}
+        for cert in certs:
+            cls.BY_ALGO.setdefault(cert.algorithm, []).append(cert)
+
+
+@total_ordering
 class Protocol(object):
+    """
+    Protocols are ordered by their S2N protocol version number.
+    total_ordering derives the remaining comparisons from __eq__ and
+    __lt__.
+    """
+    __slots__ = ('name', 'value')
+
     def __init__(self, name, value):
-        self.name = name
+        self.name = sys.intern(name)
         self.value = value
 
-    def __gt__(self, other):
-        return self.value > other.value
-
-    def __ge__(self, other):
-        return self.value >= other.value
+    def __eq__(self, other):
+        return self.value == other.value
 
     def __lt__(self, other):
         return self.value < other.value
 
-    def __le__(self, other):
-        return self.value <= other.value
-
-    def __eq__(self, other):
-        return self.value == other.value
-
     def __str__(self):
         return self.name
 
@@ -156,80 +246,107 @@ class Protocols(object):
     SSLv3 = Protocol("SSLv3", 30)
 
 
+# Every protocol, newest first. A tuple iterates faster than a list and
+# cannot be mutated by a test.
+Protocols.ALL = (Protocols.TLS13, Protocols.TLS12, Protocols.TLS11,
+                 Protocols.TLS10, Protocols.SSLv3)
+
+
 class Cipher(object):
+    __slots__ = ('name', 'min_version', 'openssl1_1_1', 'fips', 'parameters',
+                 'algorithm', '_hash')
+
     def __init__(self, name, min_version, openssl1_1_1, fips, parameters=None):
-        self.name = name
+        self.name = sys.intern(name)
         self.min_version = min_version
         self.openssl1_1_1 = openssl1_1_1
         self.fips = fips
         self.parameters = parameters
-        self.algorithm = 'ANY'
-
-        if 'ECDSA' in name:
-            self.algorithm = 'EC'
-        elif 'RSA' in name:
-            self.algorithm = 'RSA'
+        self.algorithm = _algorithm_from_name(name)
+        # Ciphers end up in sets and dict keys inside the test filters;
+        # hash the name once instead of on every lookup.
+        self._hash = hash(name)
 
     def __eq__(self, other):
+        if isinstance(other, Cipher):
+            return self.name == other.name
         return self.name == other
 
     def __hash__(self):
-        return hash(self.name)
+        return self._hash
 
     def __str__(self):
         return self.name
 
 
-class Ciphers(object):
+class Ciphers(object, metaclass=_LazyTableMeta):
     """
     When referencing ciphers, use these class values.
     """
-    DHE_RSA_DES_CBC3_SHA = Cipher("DHE-RSA-DES-CBC3-SHA", Protocols.SSLv3, False, False)
-    DHE_RSA_AES128_SHA = Cipher("DHE-RSA-AES128-SHA", Protocols.SSLv3, True, False, TEST_CERT_DIRECTORY + 'dhparams_2048.pem')
-    DHE_RSA_AES256_SHA = Cipher("DHE-RSA-AES256-SHA", Protocols.SSLv3, True, False, TEST_CERT_DIRECTORY + 'dhparams_2048.pem')
-    DHE_RSA_AES128_SHA256 = Cipher("DHE-RSA-AES128-SHA256", Protocols.TLS12, True, True, TEST_CERT_DIRECTORY + 'dhparams_2048.pem')
-    DHE_RSA_AES256_SHA256 = Cipher("DHE-RSA-AES256-SHA256", Protocols.TLS12, True, True, TEST_CERT_DIRECTORY + 'dhparams_2048.pem')
-    DHE_RSA_AES128_GCM_SHA256 = Cipher("DHE-RSA-AES128-GCM-SHA256", Protocols.TLS12, True, True, TEST_CERT_DIRECTORY + 'dhparams_2048.pem')
-    DHE_RSA_AES256_GCM_SHA384 = Cipher("DHE-RSA-AES256-GCM-SHA384", Protocols.TLS12, True, True, TEST_CERT_DIRECTORY + 'dhparams_2048.pem')
-    DHE_RSA_CHACHA20_POLY1305 = Cipher("DHE-RSA-CHACHA20-POLY1305", Protocols.TLS12, True, False, TEST_CERT_DIRECTORY + 'dhparams_2048.pem')
-
-    AES128_SHA = Cipher("AES128-SHA", Protocols.SSLv3, True, True)
-    AES256_SHA = Cipher("AES256-SHA", Protocols.SSLv3, True, True)
-    AES128_SHA256 = Cipher("AES128-SHA256", Protocols.TLS12, True, True)
-    AES256_SHA256 = Cipher("AES256-SHA256", Protocols.TLS12, True, True)
-    AES128_GCM_SHA256 = Cipher("TLS_AES_128_GCM_SHA256", Protocols.TLS13, True, True)
-    AES256_GCM_SHA384 = Cipher("TLS_AES_256_GCM_SHA384", Protocols.TLS13, True, True)
-
-    ECDHE_ECDSA_AES128_SHA = Cipher("ECDHE-ECDSA-AES128-SHA", Protocols.SSLv3, True, False)
-    ECDHE_ECDSA_AES256_SHA = Cipher("ECDHE-ECDSA-AES256-SHA", Protocols.SSLv3, True, False)
-    ECDHE_ECDSA_AES128_SHA256 = Cipher("ECDHE-ECDSA-AES128-SHA256", Protocols.TLS12, True, True)
-    ECDHE_ECDSA_AES256_SHA384 = Cipher("ECDHE-ECDSA-AES256-SHA384", Protocols.TLS12, True, True)
-    ECDHE_ECDSA_AES128_GCM_SHA256 = Cipher("ECDHE-ECDSA-AES128-GCM-SHA256", Protocols.TLS12, True, True)
-    ECDHE_ECDSA_AES256_GCM_SHA384 = Cipher("ECDHE-ECDSA-AES256-GCM-SHA384", Protocols.TLS12, True, True)
-    ECDHE_ECDSA_CHACHA20_POLY1305 = Cipher("ECDHE-ECDSA-CHACHA20-POLY1305", Protocols.TLS12, True, False)
-
-    ECDHE_RSA_DES_CBC3_SHA = Cipher("ECDHE-RSA-DES-CBC3-SHA", Protocols.SSLv3, False, False)
-    ECDHE_RSA_AES128_SHA = Cipher("ECDHE-RSA-AES128-SHA", Protocols.SSLv3, True, False)
-    ECDHE_RSA_AES256_SHA = Cipher("ECDHE-RSA-AES256-SHA", Protocols.SSLv3, True, False)
-    ECDHE_RSA_RC4_SHA = Cipher("ECDHE-RSA-RC4-SHA", Protocols.SSLv3, False, False)
-    ECDHE_RSA_AES128_SHA256 = Cipher("ECDHE-RSA-AES128-SHA256", Protocols.TLS12, True, True)
-    ECDHE_RSA_AES256_SHA384 = Cipher("ECDHE-RSA-AES256-SHA384", Protocols.TLS12, True, True)
-    ECDHE_RSA_AES128_GCM_SHA256 = Cipher("ECDHE-RSA-AES128-GCM-SHA256", Protocols.TLS12, True, True)
-    ECDHE_RSA_AES256_GCM_SHA384 = Cipher("ECDHE-RSA-AES256-GCM-SHA384", Protocols.TLS12, True, True)
-    ECDHE_RSA_CHACHA20_POLY1305 = Cipher("ECDHE-RSA-CHACHA20-POLY1305", Protocols.TLS12, True, False)
-    CHACHA20_POLY1305_SHA256 = Cipher("TLS_CHACHA20_POLY1305_SHA256", Protocols.TLS13, True, False)
-
-    KMS_TLS_1_0_2018_10 = Cipher("KMS-TLS-1-0-2018-10", Protocols.TLS10, False, False)
-    KMS_PQ_TLS_1_0_2019_06 = Cipher("KMS-PQ-TLS-1-0-2019-06", Protocols.TLS10, False, False)
-    KMS_PQ_TLS_1_0_2020_02 = Cipher("KMS-PQ-TLS-1-0-2020-02", Protocols.TLS10, False, False)
-    PQ_SIKE_TEST_TLS_1_0_2019_11 = Cipher("PQ-SIKE-TEST-TLS-1-0-2019-11", Protocols.TLS10, False, False)
-    PQ_SIKE_TEST_TLS_1_0_2020_02 = Cipher("PQ-SIKE-TEST-TLS-1-0-2020-02", Protocols.TLS10, False, False)
+    _entry = Cipher
+    _lazy_indexes = ('ALL', 'BY_NAME', 'BY_ALGO', 'BY_MIN_VERSION')
+    _spec = {
+        'DHE_RSA_DES_CBC3_SHA': ("DHE-RSA-DES-CBC3-SHA", Protocols.SSLv3, False, False),
+        'DHE_RSA_AES128_SHA': ("DHE-RSA-AES128-SHA", Protocols.SSLv3, True, False, TEST_CERT_DIRECTORY + 'dhparams_2048.pem'),
+        'DHE_RSA_AES256_SHA': ("DHE-RSA-AES256-SHA", Protocols.SSLv3, True, False, TEST_CERT_DIRECTORY + 'dhparams_2048.pem'),
+        'DHE_RSA_AES128_SHA256': ("DHE-RSA-AES128-SHA256", Protocols.TLS12, True, True, TEST_CERT_DIRECTORY + 'dhparams_2048.pem'),
+        'DHE_RSA_AES256_SHA256': ("DHE-RSA-AES256-SHA256", Protocols.TLS12, True, True, TEST_CERT_DIRECTORY + 'dhparams_2048.pem'),
+        'DHE_RSA_AES128_GCM_SHA256': ("DHE-RSA-AES128-GCM-SHA256", Protocols.TLS12, True, True, TEST_CERT_DIRECTORY + 'dhparams_2048.pem'),
+        'DHE_RSA_AES256_GCM_SHA384': ("DHE-RSA-AES256-GCM-SHA384", Protocols.TLS12, True, True, TEST_CERT_DIRECTORY + 'dhparams_2048.pem'),
+        'DHE_RSA_CHACHA20_POLY1305': ("DHE-RSA-CHACHA20-POLY1305", Protocols.TLS12, True, False, TEST_CERT_DIRECTORY + 'dhparams_2048.pem'),
+
+        'AES128_SHA': ("AES128-SHA", Protocols.SSLv3, True, True),
+        'AES256_SHA': ("AES256-SHA", Protocols.SSLv3, True, True),
+        'AES128_SHA256': ("AES128-SHA256", Protocols.TLS12, True, True),
+        'AES256_SHA256': ("AES256-SHA256", Protocols.TLS12, True, True),
+        'AES128_GCM_SHA256': ("TLS_AES_128_GCM_SHA256", Protocols.TLS13, True, True),
+        'AES256_GCM_SHA384': ("TLS_AES_256_GCM_SHA384", Protocols.TLS13, True, True),
+
+        'ECDHE_ECDSA_AES128_SHA': ("ECDHE-ECDSA-AES128-SHA", Protocols.SSLv3, True, False),
+        'ECDHE_ECDSA_AES256_SHA': ("ECDHE-ECDSA-AES256-SHA", Protocols.SSLv3, True, False),
+        'ECDHE_ECDSA_AES128_SHA256': ("ECDHE-ECDSA-AES128-SHA256", Protocols.TLS12, True, True),
+        'ECDHE_ECDSA_AES256_SHA384': ("ECDHE-ECDSA-AES256-SHA384", Protocols.TLS12, True, True),
+        'ECDHE_ECDSA_AES128_GCM_SHA256': ("ECDHE-ECDSA-AES128-GCM-SHA256", Protocols.TLS12, True, True),
+        'ECDHE_ECDSA_AES256_GCM_SHA384': ("ECDHE-ECDSA-AES256-GCM-SHA384", Protocols.TLS12, True, True),
+        'ECDHE_ECDSA_CHACHA20_POLY1305': ("ECDHE-ECDSA-CHACHA20-POLY1305", Protocols.TLS12, True, False),
+
+        'ECDHE_RSA_DES_CBC3_SHA': ("ECDHE-RSA-DES-CBC3-SHA", Protocols.SSLv3, False, False),
+        'ECDHE_RSA_AES128_SHA': ("ECDHE-RSA-AES128-SHA", Protocols.SSLv3, True, False),
+        'ECDHE_RSA_AES256_SHA': ("ECDHE-RSA-AES256-SHA", Protocols.SSLv3, True, False),
+        'ECDHE_RSA_RC4_SHA': ("ECDHE-RSA-RC4-SHA", Protocols.SSLv3, False, False),
+        'ECDHE_RSA_AES128_SHA256': ("ECDHE-RSA-AES128-SHA256", Protocols.TLS12, True, True),
+        'ECDHE_RSA_AES256_SHA384': ("ECDHE-RSA-AES256-SHA384", Protocols.TLS12, True, True),
+        'ECDHE_RSA_AES128_GCM_SHA256': ("ECDHE-RSA-AES128-GCM-SHA256", Protocols.TLS12, True, True),
+        'ECDHE_RSA_AES256_GCM_SHA384': ("ECDHE-RSA-AES256-GCM-SHA384", Protocols.TLS12, True, True),
+        'ECDHE_RSA_CHACHA20_POLY1305': ("ECDHE-RSA-CHACHA20-POLY1305", Protocols.TLS12, True, False),
+        'CHACHA20_POLY1305_SHA256': ("TLS_CHACHA20_POLY1305_SHA256", Protocols.TLS13, True, False),
+
+        'KMS_TLS_1_0_2018_10': ("KMS-TLS-1-0-2018-10", Protocols.TLS10, False, False),
+        'KMS_PQ_TLS_1_0_2019_06': ("KMS-PQ-TLS-1-0-2019-06", Protocols.TLS10, False, False),
+        'KMS_PQ_TLS_1_0_2020_02': ("KMS-PQ-TLS-1-0-2020-02", Protocols.TLS10, False, False),
+        'PQ_SIKE_TEST_TLS_1_0_2019_11': ("PQ-SIKE-TEST-TLS-1-0-2019-11", Protocols.TLS10, False, False),
+        'PQ_SIKE_TEST_TLS_1_0_2020_02': ("PQ-SIKE-TEST-TLS-1-0-2020-02", Protocols.TLS10, False, False),
+    }
+
+    @classmethod
+    def _build_indexes(cls):
+        ciphers = [getattr(cls, name) for name in cls._spec]
+        cls.ALL = tuple(ciphers)
+        cls.BY_NAME = {c.name: c for c in ciphers}
+        cls.BY_ALGO = {}
+        cls.BY_MIN_VERSION = {}
+        for cipher in ciphers:
+            cls.BY_ALGO.setdefault(cipher.algorithm, []).append(cipher)
+            cls.BY_MIN_VERSION.setdefault(cipher.min_version.value, []).append(cipher)
 
 
 class Curve(object):
+    __slots__ = ('name', 'min_protocol', '_family')
+
     def __init__(self, name, min_protocol=Protocols.SSLv3):
-        self.name = name
+        self.name = sys.intern(name)
         self.min_protocol = min_protocol
+        self._family = self.name[:-3]
 
     def __str__(self):
         return self.name
@@ -245,108 +362,137 @@ class Curves(object):
     P384 = Curve("P-384")
 
 
+Curves.ALL = (Curves.X25519, Curves.P256, Curves.P384)
+
+
+# Cert/cipher and cert/curve compatibility is evaluated for every
+# combination the parametrized tests generate, but the answer only
+# depends on the fixed tables above. Memoize each pair the first time it
+# is seen so the hot deselection path is a single dict hit.
+_CIPHER_COMPAT = {}
+_CURVE_COMPAT = {}
+
+
+def is_cipher_compatible(cert, cipher):
+    key = (cert, cipher)
+    result = _CIPHER_COMPAT.get(key)
+    if result is None:
+        result = _CIPHER_COMPAT[key] = cert.compatible_with_cipher(cipher)
+    return result
+
+
+def is_curve_compatible(cert, curve):
+    key = (cert, curve)
+    result = _CURVE_COMPAT.get(key)
+    if result is None:
+        result = _CURVE_COMPAT[key] = cert.compatible_with_curve(curve)
+    return result
+
+
 class Results(object):
     """
     An instance of this object will be returned to the test by a managed_process'
     get_results() method.
     """
-
-    # Byte array containing the standard output of the process
-    stdout = None
-
-    # Byte array containing the standard error of the process
-    stderr = None
-
-    # Exit code of the process
-    exit_code = None
-
-    # Any exception thrown while running the process
-    exception = None
+    __slots__ = ('stdout', 'stderr', 'exit_code', 'exception')
 
     def __init__(self, stdout, stderr, exit_code, exception):
+        # Byte array containing the standard output of the process
         self.stdout = stdout
+
+        # Byte array containing the standard error of the process
         self.stderr = stderr
+
+        # Exit code of the process
         self.exit_code = exit_code
+
+        # Any exception thrown while running the process
         self.exception = exception
 
     def __str__(self):
         return "Stdout: {}\nStderr: {}\nExit code: {}\nException: {}".format(self.stdout, self.stderr, self.exit_code, self.exception)
 
 
-class ProviderOptions(object):
-    def __init__(self,
-            mode=None,
-            host=None,
-            port=None,
-            cipher=None,
-            curve=None,
-            key=None,
-            cert=None,
-            use_session_ticket=False,
-            insecure=False,
-            data_to_send=None,
-            use_client_auth=False,
-            client_key_file=None,
-            client_certificate_file=None,
-            extra_flags=None,
-            client_trust_store=None,
-            reconnects_before_exit=None,
-            reconnect=None,
-            verify_hostname=None,
-            server_name=None,
-            protocol=None):
+@lru_cache(maxsize=None)
+def _port_str(port):
+    """
+    Ports come from AvailablePorts and repeat across test cases; cache
+    the command-line string form instead of re-stringifying per
+    ProviderOptions construction.
+    """
+    return str(port)
+
+
+@dataclass
+class _ProviderOptionsFields:
+    """
+    Field definitions and defaults for ProviderOptions. This lives on a
+    separate base class because a dataclass cannot declare defaults and
+    __slots__ on the same class before Python 3.10's slots=True, and the
+    integration tests still run under py38 (see tox.ini); the subclass
+    supplies the slots.
+    """
+    __slots__ = ()
+
+    # Client or server
+    mode: Any = None
+
+    # Hostname
+    host: Any = None
+
+    # Port (string because this will be converted to a command line)
+    port: Any = None
 
-        # Client or server
-        self.mode = mode
+    # Cipher suite
+    cipher: Any = None
 
-        # Hostname
-        self.host = host
+    # Named curve
+    curve: Any = None
 
-        # Port (string because this will be converted to a command line
-        self.port = str(port)
+    # Path to a key PEM
+    key: Any = None
 
-        # Cipher suite
-        self.cipher = cipher
+    # Path to a certificate PEM
+    cert: Any = None
 
-        # Named curve
-        self.curve = curve
+    # Boolean whether to use a resumption ticket
+    use_session_ticket: Any = False
 
-        # Path to a key PEM
-        self.key = key
+    # Boolean whether to allow insecure certificates
+    insecure: Any = False
 
-        # Path to a certificate PEM
-        self.cert = cert
+    # This data will be sent to the peer
+    data_to_send: Any = None
 
-        # Boolean whether to use a resumption ticket
-        self.use_session_ticket = use_session_ticket
+    # Parameters to configure client authentication
+    use_client_auth: Any = False
+    client_key_file: Any = None
+    client_certificate_file: Any = None
+    client_trust_store: Any = None
 
-        # Boolean whether to allow insecure certificates
-        self.insecure = insecure
+    # Extra flags to pass to the provider
+    extra_flags: Any = None
 
-        # Which protocol to use with this provider
-        self.protocol = protocol
+    # Reconnects on the server side (includes first connection)
+    reconnects_before_exit: Any = None
 
-        # This data will be sent to the peer
-        self.data_to_send = data_to_send
+    # Tell the client to reconnect
+    reconnect: Any = None
 
-        # Parameters to configure client authentication
-        self.use_client_auth = use_client_auth
-        self.client_certificate_file = client_certificate_file
-        self.client_trust_store = client_trust_store
-        self.client_key_file = client_key_file
+    # Tell the client to verify that the hostname returned by the server
+    # matches this argument
+    verify_hostname: Any = None
 
-        # Reconnects on the server side (includes first connection)
-        self.reconnects_before_exit = reconnects_before_exit
+    # Tell the client to send this server name to the server
+    server_name: Any = None
 
-        # Tell the client to reconnect
-        self.reconnect = reconnect
+    # Which protocol to use with this provider
+    protocol: Any = None
 
-        # Tell the client to verify that the hostname returned by the server
-        # matches this argument
-        self.verify_hostname = verify_hostname
+    def __post_init__(self):
+        if self.port is not None:
+            self.port = _port_str(self.port)
 
-        # Tell the client to send this server name to the server
-        self.server_name = server_name
 
-        # Extra flags to pass to the provider
-        self.extra_flags = extra_flags
+class ProviderOptions(_ProviderOptionsFields):
+    __slots__ = tuple(f.name for f in fields(_ProviderOptionsFields))
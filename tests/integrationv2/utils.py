@@ -1,4 +1,4 @@
-from common import Protocols
+from common import Protocols, is_cipher_compatible, is_curve_compatible
 from providers import S2N, OpenSSL
 
 
@@ -63,10 +63,10 @@ def invalid_test_parameters(*args, **kwargs):
     # If we are using a cipher that depends on a specific certificate algorithm
     # deselect the test of the wrong certificate is used.
     if certificate is not None:
-        if cipher is not None and certificate.compatible_with_cipher(cipher) is False:
+        if cipher is not None and is_cipher_compatible(certificate, cipher) is False:
             return True
 
-        if curve is not None and certificate.compatible_with_curve(curve) is False:
+        if curve is not None and is_curve_compatible(certificate, curve) is False:
             return True
 
     # Prevent situations like using X25519 with TLS1.2